@@ -9,6 +9,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
+import threading
 from pathlib import Path
 
 app = FastAPI(title="Mergington High School API",
@@ -25,59 +26,63 @@ activities = {
         "description": "Develop tennis skills and compete in friendly matches",
         "schedule": "Wednesdays and Saturdays, 4:00 PM - 5:30 PM",
         "max_participants": 16,
-        "participants": ["alex@mergington.edu"]
+        "participants": dict.fromkeys(["alex@mergington.edu"])
         },
         "Basketball Team": {
         "description": "Join our competitive basketball team",
         "schedule": "Mondays and Thursdays, 4:00 PM - 5:30 PM",
         "max_participants": 15,
-        "participants": ["james@mergington.edu", "sarah@mergington.edu"]
+        "participants": dict.fromkeys(["james@mergington.edu", "sarah@mergington.edu"])
         },
         "Art Studio": {
         "description": "Explore painting, drawing, and mixed media techniques",
         "schedule": "Tuesdays and Fridays, 3:30 PM - 5:00 PM",
         "max_participants": 18,
-        "participants": ["lucy@mergington.edu"]
+        "participants": dict.fromkeys(["lucy@mergington.edu"])
         },
         "Music Ensemble": {
         "description": "Play instruments and perform in school concerts",
         "schedule": "Mondays and Wednesdays, 4:00 PM - 5:00 PM",
         "max_participants": 25,
-        "participants": ["isabella@mergington.edu", "noah@mergington.edu"]
+        "participants": dict.fromkeys(["isabella@mergington.edu", "noah@mergington.edu"])
         },
         "Debate Team": {
         "description": "Develop critical thinking and public speaking skills",
         "schedule": "Thursdays, 3:30 PM - 5:00 PM",
         "max_participants": 20,
-        "participants": ["william@mergington.edu"]
+        "participants": dict.fromkeys(["william@mergington.edu"])
         },
         "Robotics Club": {
         "description": "Design and build robots for competitions",
         "schedule": "Wednesdays, 3:30 PM - 5:30 PM",
         "max_participants": 14,
-        "participants": ["lucas@mergington.edu", "ava@mergington.edu"]
+        "participants": dict.fromkeys(["lucas@mergington.edu", "ava@mergington.edu"])
         },
     "Chess Club": {
         "description": "Learn strategies and compete in chess tournaments",
         "schedule": "Fridays, 3:30 PM - 5:00 PM",
         "max_participants": 12,
-        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+        "participants": dict.fromkeys(["michael@mergington.edu", "daniel@mergington.edu"])
     },
     "Programming Class": {
         "description": "Learn programming fundamentals and build software projects",
         "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
         "max_participants": 20,
-        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+        "participants": dict.fromkeys(["emma@mergington.edu", "sophia@mergington.edu"])
     },
     "Gym Class": {
         "description": "Physical education and sports activities",
         "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
         "max_participants": 30,
-        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+        "participants": dict.fromkeys(["john@mergington.edu", "olivia@mergington.edu"])
     }
 }
 
 
+# Guards activities against concurrent requests served from the threadpool
+activities_lock = threading.Lock()
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
@@ -85,7 +90,13 @@ def root():
 
 @app.get("/activities")
 def get_activities():
-    return activities
+    # Copy participants into lists while holding the lock so serialization
+    # never iterates a roster that another request is mutating
+    with activities_lock:
+        return {
+            name: {**details, "participants": list(details["participants"])}
+            for name, details in activities.items()
+        }
 
 
 @app.post("/activities/{activity_name}/signup")
@@ -98,12 +109,13 @@ def signup_for_activity(activity_name: str, email: str):
     # Get the specific activity
     activity = activities[activity_name]
 
-# Validate student is not already signed up
-    if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student already signed up for this activity")
+    with activities_lock:
+        # Validate student is not already signed up
+        if email in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student already signed up for this activity")
 
-    # Add student
-    activity["participants"].append(email)
+        # Add student
+        activity["participants"][email] = None
     return {"message": f"Signed up {email} for {activity_name}"}
 
 @app.delete("/activities/{activity_name}/unregister")
@@ -116,10 +128,11 @@ def unregister_from_activity(activity_name: str, email: str):
     # Get the specific activity
     activity = activities[activity_name]
 
-    # Validate student is signed up
-    if email not in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student not found in this activity")
+    with activities_lock:
+        # Validate student is signed up
+        if email not in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student not found in this activity")
 
-    # Remove student
-    activity["participants"].remove(email)
+        # Remove student
+        del activity["participants"][email]
     return {"message": f"Removed {email} from {activity_name}"}
\ No newline at end of file
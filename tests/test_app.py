@@ -1,104 +1,89 @@
 """Tests for the Mergington High School Activities API"""
 
+import asyncio
+import copy
+import functools
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
 
-# Add src to path so we can import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from app import app, activities
 
-from app import app
 
+@functools.lru_cache(maxsize=1)
+def _template():
+    """Snapshot of the activities database, built once and cached"""
+    return copy.deepcopy(activities)
 
-@pytest.fixture
+
+# Prime the cache before any test has a chance to mutate activities
+_template()
+
+# Pre-encoded endpoint URL templates; format with the student's email
+TENNIS_SIGNUP = "/activities/Tennis%20Club/signup?email={}"
+TENNIS_UNREGISTER = "/activities/Tennis%20Club/unregister?email={}"
+BASKETBALL_SIGNUP = "/activities/Basketball%20Team/signup?email={}"
+BASKETBALL_UNREGISTER = "/activities/Basketball%20Team/unregister?email={}"
+ART_SIGNUP = "/activities/Art%20Studio/signup?email={}"
+MISSING_SIGNUP = "/activities/NonExistent%20Activity/signup?email={}"
+MISSING_UNREGISTER = "/activities/NonExistent%20Activity/unregister?email={}"
+
+
+def _json(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
+
+
+def _reset_activities():
+    """Restore only the activities that differ from the template"""
+    template = _template()
+    for name in activities.keys() - template.keys():
+        del activities[name]
+    for name, details in template.items():
+        current = activities.get(name)
+        # Dict equality ignores key order, so compare rosters as lists too
+        if current != details or list(current["participants"]) != list(details["participants"]):
+            activities[name] = copy.deepcopy(details)
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
+    """Create a single test client shared across the test session"""
     return TestClient(app)
 
 
 @pytest.fixture
-def reset_activities():
+def activities_readonly():
+    """Read-only access to activities; no reset needed"""
+    yield
+
+
+@pytest.fixture
+def activities_mutable():
     """Reset activities to initial state after each test"""
-    from app import activities
-    initial_state = {
-        "Tennis Club": {
-            "description": "Develop tennis skills and compete in friendly matches",
-            "schedule": "Wednesdays and Saturdays, 4:00 PM - 5:30 PM",
-            "max_participants": 16,
-            "participants": ["alex@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Join our competitive basketball team",
-            "schedule": "Mondays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu", "sarah@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and mixed media techniques",
-            "schedule": "Tuesdays and Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["lucy@mergington.edu"]
-        },
-        "Music Ensemble": {
-            "description": "Play instruments and perform in school concerts",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": ["isabella@mergington.edu", "noah@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop critical thinking and public speaking skills",
-            "schedule": "Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 20,
-            "participants": ["william@mergington.edu"]
-        },
-        "Robotics Club": {
-            "description": "Design and build robots for competitions",
-            "schedule": "Wednesdays, 3:30 PM - 5:30 PM",
-            "max_participants": 14,
-            "participants": ["lucas@mergington.edu", "ava@mergington.edu"]
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        }
-    }
     yield
     # Reset after test
-    activities.clear()
-    activities.update(initial_state)
+    _reset_activities()
 
 
+@pytest.mark.smoke
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
 
-    def test_get_activities(self, client, reset_activities):
+    def test_get_activities(self, client, activities_readonly):
         """Test retrieving all activities"""
         response = client.get("/activities")
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, dict)
         assert "Tennis Club" in data
         assert "Basketball Team" in data
 
-    def test_activities_structure(self, client, reset_activities):
+    def test_activities_structure(self, client, activities_readonly):
         """Test that activities have required fields"""
         response = client.get("/activities")
-        data = response.json()
+        data = _json(response)
         activity = data["Tennis Club"]
         
         assert "description" in activity
@@ -107,10 +92,10 @@ class TestGetActivities:
         assert "participants" in activity
         assert isinstance(activity["participants"], list)
 
-    def test_activities_have_correct_participants(self, client, reset_activities):
+    def test_activities_have_correct_participants(self, client, activities_readonly):
         """Test that participants are loaded correctly"""
         response = client.get("/activities")
-        data = response.json()
+        data = _json(response)
         
         assert "alex@mergington.edu" in data["Tennis Club"]["participants"]
         assert "james@mergington.edu" in data["Basketball Team"]["participants"]
@@ -119,154 +104,236 @@ class TestGetActivities:
 class TestSignup:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
 
-    def test_signup_success(self, client, reset_activities):
+    def test_signup_success(self, client, activities_mutable):
         """Test successful signup for an activity"""
         response = client.post(
-            "/activities/Tennis%20Club/signup?email=newemail@mergington.edu"
+            TENNIS_SIGNUP.format("newemail@mergington.edu")
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert "Signed up" in data["message"]
         assert "newemail@mergington.edu" in data["message"]
 
-    def test_signup_adds_participant(self, client, reset_activities):
+    def test_signup_adds_participant(self, client, activities_mutable):
         """Test that signup actually adds the participant"""
         new_email = "test@mergington.edu"
-        client.post(f"/activities/Tennis%20Club/signup?email={new_email}")
+        client.post(TENNIS_SIGNUP.format(new_email))
         
         response = client.get("/activities")
-        data = response.json()
+        data = _json(response)
         assert new_email in data["Tennis Club"]["participants"]
 
-    def test_signup_activity_not_found(self, client, reset_activities):
+    def test_signup_activity_not_found(self, client, activities_mutable):
         """Test signup to non-existent activity"""
         response = client.post(
-            "/activities/NonExistent%20Activity/signup?email=test@mergington.edu"
+            MISSING_SIGNUP.format("test@mergington.edu")
         )
         assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
+        assert "Activity not found" in _json(response)["detail"]
 
-    def test_signup_already_signed_up(self, client, reset_activities):
+    def test_signup_already_signed_up(self, client, activities_mutable):
         """Test signup when already registered"""
         response = client.post(
-            "/activities/Tennis%20Club/signup?email=alex@mergington.edu"
+            TENNIS_SIGNUP.format("alex@mergington.edu")
         )
         assert response.status_code == 400
-        assert "already signed up" in response.json()["detail"]
+        assert "already signed up" in _json(response)["detail"]
 
-    def test_signup_fills_spots(self, client, reset_activities):
+    def test_signup_fills_spots(self, client, activities_mutable):
         """Test that signup respects max participants limit by checking count"""
         response = client.get("/activities")
-        activity_before = response.json()["Tennis Club"]
+        activity_before = _json(response)["Tennis Club"]
         initial_count = len(activity_before["participants"])
         
         response = client.post(
-            "/activities/Tennis%20Club/signup?email=newstudent@mergington.edu"
+            TENNIS_SIGNUP.format("newstudent@mergington.edu")
         )
         assert response.status_code == 200
         
         response = client.get("/activities")
-        activity_after = response.json()["Tennis Club"]
+        activity_after = _json(response)["Tennis Club"]
         assert len(activity_after["participants"]) == initial_count + 1
 
+    def test_signup_appends_in_signup_order(self, client, activities_mutable):
+        """Test that participants are returned in signup order"""
+        emails = ["zed@mergington.edu", "amy@mergington.edu"]
+        for email in emails:
+            client.post(TENNIS_SIGNUP.format(email))
+        
+        response = client.get("/activities")
+        participants = _json(response)["Tennis Club"]["participants"]
+        assert participants == ["alex@mergington.edu"] + emails
+
 
 class TestUnregister:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
 
-    def test_unregister_success(self, client, reset_activities):
+    def test_unregister_success(self, client, activities_mutable):
         """Test successful unregister from an activity"""
         response = client.delete(
-            "/activities/Tennis%20Club/unregister?email=alex@mergington.edu"
+            TENNIS_UNREGISTER.format("alex@mergington.edu")
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert "Removed" in data["message"]
         assert "alex@mergington.edu" in data["message"]
 
-    def test_unregister_removes_participant(self, client, reset_activities):
+    def test_unregister_removes_participant(self, client, activities_mutable):
         """Test that unregister actually removes the participant"""
         client.delete(
-            "/activities/Tennis%20Club/unregister?email=alex@mergington.edu"
+            TENNIS_UNREGISTER.format("alex@mergington.edu")
         )
         
         response = client.get("/activities")
-        data = response.json()
+        data = _json(response)
         assert "alex@mergington.edu" not in data["Tennis Club"]["participants"]
 
-    def test_unregister_activity_not_found(self, client, reset_activities):
+    def test_unregister_activity_not_found(self, client, activities_mutable):
         """Test unregister from non-existent activity"""
         response = client.delete(
-            "/activities/NonExistent%20Activity/unregister?email=test@mergington.edu"
+            MISSING_UNREGISTER.format("test@mergington.edu")
         )
         assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
+        assert "Activity not found" in _json(response)["detail"]
 
-    def test_unregister_not_participant(self, client, reset_activities):
+    def test_unregister_not_participant(self, client, activities_mutable):
         """Test unregister when not a participant"""
         response = client.delete(
-            "/activities/Tennis%20Club/unregister?email=notregistered@mergington.edu"
+            TENNIS_UNREGISTER.format("notregistered@mergington.edu")
         )
         assert response.status_code == 400
-        assert "not found in this activity" in response.json()["detail"]
+        assert "not found in this activity" in _json(response)["detail"]
 
-    def test_unregister_then_can_signup_again(self, client, reset_activities):
+    def test_unregister_then_can_signup_again(self, client, activities_mutable):
         """Test that after unregistering, student can sign up again"""
         email = "alex@mergington.edu"
         
         # Unregister
-        client.delete(f"/activities/Tennis%20Club/unregister?email={email}")
+        client.delete(TENNIS_UNREGISTER.format(email))
         
         # Verify unregistered
-        response = client.get("/activities")
-        assert email not in response.json()["Tennis Club"]["participants"]
+        assert email not in activities["Tennis Club"]["participants"]
         
         # Sign up again
-        response = client.post(f"/activities/Tennis%20Club/signup?email={email}")
+        response = client.post(TENNIS_SIGNUP.format(email))
         assert response.status_code == 200
         
         # Verify signed up
         response = client.get("/activities")
-        assert email in response.json()["Tennis Club"]["participants"]
+        assert email in _json(response)["Tennis Club"]["participants"]
 
 
+@pytest.mark.integration
 class TestIntegration:
     """Integration tests combining multiple operations"""
 
-    def test_signup_and_unregister_workflow(self, client, reset_activities):
+    def test_signup_and_unregister_workflow(self, client, activities_mutable):
         """Test complete workflow of signup and unregister"""
         email = "integration@mergington.edu"
-        activity = "Basketball%20Team"
         
         # Verify not in list
-        response = client.get("/activities")
-        assert email not in response.json()["Basketball Team"]["participants"]
+        assert email not in activities["Basketball Team"]["participants"]
         
         # Sign up
-        response = client.post(f"/activities/{activity}/signup?email={email}")
+        response = client.post(BASKETBALL_SIGNUP.format(email))
         assert response.status_code == 200
         
         # Verify in list
-        response = client.get("/activities")
-        assert email in response.json()["Basketball Team"]["participants"]
+        assert email in activities["Basketball Team"]["participants"]
         
         # Unregister
-        response = client.delete(f"/activities/{activity}/unregister?email={email}")
+        response = client.delete(BASKETBALL_UNREGISTER.format(email))
         assert response.status_code == 200
         
         # Verify not in list
         response = client.get("/activities")
-        assert email not in response.json()["Basketball Team"]["participants"]
+        assert email not in _json(response)["Basketball Team"]["participants"]
 
-    def test_multiple_signups_same_activity(self, client, reset_activities):
-        """Test multiple students signing up for the same activity"""
-        activity = "Art%20Studio"
+    @pytest.mark.asyncio
+    async def test_multiple_signups_same_activity(self, activities_mutable):
+        """Test multiple students signing up concurrently for the same activity"""
         emails = ["student1@mergington.edu", "student2@mergington.edu", "student3@mergington.edu"]
+        urls = [ART_SIGNUP.format(email) for email in emails]
         
-        for email in emails:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == 200
-        
-        response = client.get("/activities")
-        data = response.json()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(*[ac.post(url) for url in urls])
+            for response in responses:
+                assert response.status_code == 200
+            
+            response = await ac.get("/activities")
+        data = _json(response)
         for email in emails:
             assert email in data["Art Studio"]["participants"]
+
+
+class TestReset:
+    """Tests for restoring activities between tests"""
+
+    @pytest.fixture
+    def assert_rosters_restored(self):
+        """Check roster order after activities_mutable has torn down"""
+        yield
+        for name, details in _template().items():
+            assert list(activities[name]["participants"]) == list(details["participants"])
+
+    def test_reset_restores_roster_order(self, client, activities_mutable):
+        """Test that reset restores the template order of a reordered roster"""
+        email = "james@mergington.edu"
+        client.delete(BASKETBALL_UNREGISTER.format(email))
+        client.post(BASKETBALL_SIGNUP.format(email))
+        assert list(activities["Basketball Team"]["participants"]) == [
+            "sarah@mergington.edu", email
+        ]
+        
+        _reset_activities()
+        
+        assert list(activities["Basketball Team"]["participants"]) == [
+            email, "sarah@mergington.edu"
+        ]
+
+    def test_teardown_restores_roster_order(
+        self, assert_rosters_restored, client, activities_mutable
+    ):
+        """Test that fixture teardown restores participant order, not just membership"""
+        email = "james@mergington.edu"
+        client.delete(BASKETBALL_UNREGISTER.format(email))
+        client.post(BASKETBALL_SIGNUP.format(email))
+        assert set(activities["Basketball Team"]["participants"]) == set(
+            _template()["Basketball Team"]["participants"]
+        )
+
+
+class TestBenchmarks:
+    """Microbenchmarks guarding the hot endpoints against regressions
+
+    Skipped by default; run them serially with ``pytest --benchmark-only``.
+    The regression gate is a manual step: save a baseline with
+    ``pytest --benchmark-only --benchmark-autosave``, then check later runs
+    with ``--benchmark-compare --benchmark-compare-fail=mean:10%``.
+    """
+
+    def test_get_activities_bench(self, benchmark, client, activities_readonly):
+        """Benchmark GET /activities"""
+        response = benchmark(client.get, "/activities")
+        assert response.status_code == 200
+
+    def test_signup_bench(self, benchmark, client, activities_mutable):
+        """Benchmark POST signup, resetting state before each round"""
+        response = benchmark.pedantic(
+            client.post,
+            args=(TENNIS_SIGNUP.format("bench@mergington.edu"),),
+            setup=_reset_activities,
+            rounds=100,
+        )
+        assert response.status_code == 200
+
+    def test_unregister_bench(self, benchmark, client, activities_mutable):
+        """Benchmark DELETE unregister, resetting state before each round"""
+        response = benchmark.pedantic(
+            client.delete,
+            args=(TENNIS_UNREGISTER.format("alex@mergington.edu"),),
+            setup=_reset_activities,
+            rounds=100,
+        )
+        assert response.status_code == 200